@@ -0,0 +1,182 @@
+"""
+Shared Background Removal Operations
+
+In-memory white-background removal and alpha erosion used by post-process.py,
+remove-bg.py and image-resize-helper.py, so chained steps pass one pixel buffer
+along instead of saving and re-reading intermediate PNGs.
+
+Dependencies:
+    pip install Pillow numpy
+    pip install numba           (optional, parallel JIT kernel for very large images)
+    pip install opencv-python-headless  (optional, SIMD alpha erosion)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Below this many pixels NumPy wins (importing/loading Numba costs ~0.3s, more than it saves)
+KERNEL_MIN_PIXELS = 12_000_000
+
+
+def as_rgba_array(arr_or_image):
+    """Writable HxWx4 uint8 RGBA array from a PIL Image (copied) or an RGBA array (used as-is)"""
+    if isinstance(arr_or_image, np.ndarray):
+        return arr_or_image
+
+    # Skip the extra full-image copy convert() makes when already RGBA
+    image = arr_or_image if arr_or_image.mode == 'RGBA' else arr_or_image.convert('RGBA')
+    return np.array(image)
+
+
+def load_rgba_array(input_path):
+    """Decode an image file once into a writable HxWx4 uint8 array (file closed on return)"""
+    from PIL import Image
+
+    with Image.open(input_path) as image:
+        return as_rgba_array(image)
+
+
+def white_mask(data, threshold, by_average=False, inclusive=False):
+    """
+    Mask of white/light pixels in an RGBA array
+
+    By default a pixel is white when all RGB channels are above threshold (the
+    darkest channel, compared in 8-bit lanes). With by_average, its RGB average
+    must be above threshold instead (integer sum > threshold * 3, no divide).
+    With inclusive, pixels exactly at the threshold count as white too.
+    Thresholds outside 0-255 are allowed (nothing / everything is white).
+    """
+    if by_average:
+        compare = np.greater_equal if inclusive else np.greater
+        return compare(data[:, :, :3].sum(axis=2, dtype=np.uint16), threshold * 3)
+
+    # White <=> darkest channel >= lowest white value; kept in range so it fits uint8
+    darkest = data[:, :, :3].min(axis=2)
+    lowest_white = threshold if inclusive else threshold + 1
+    if lowest_white > 255:
+        return np.zeros(darkest.shape, dtype=bool)
+
+    return darkest >= np.uint8(max(lowest_white, 0))
+
+
+@lru_cache(maxsize=None)
+def threshold_alpha_kernel():
+    """
+    Optional Numba JIT kernel fusing the white test and alpha write
+
+    Compiled on first use and cached on disk (cache=True), so repeat CLI runs
+    skip the JIT warm-up.
+
+    Returns:
+        Compiled kernel, or None when numba is not installed (NumPy masks are used instead)
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, cache=True)
+    def threshold_alpha(data, threshold, by_average, inclusive):
+        """Zero alpha of white pixels in place (same test as white_mask); returns the number cleared"""
+        height, width, _ = data.shape
+        cleared = 0
+        for y in prange(height):
+            for x in range(width):
+                r = int(data[y, x, 0])
+                g = int(data[y, x, 1])
+                b = int(data[y, x, 2])
+                if by_average:
+                    value = r + g + b
+                    limit = threshold * 3
+                else:
+                    value = min(r, g, b)
+                    limit = threshold
+                if value > limit or (inclusive and value == limit):
+                    data[y, x, 3] = 0
+                    cleared += 1
+        return cleared
+
+    return threshold_alpha
+
+
+def clear_white_alpha(data, threshold=240, by_average=False, inclusive=False):
+    """
+    Zero the alpha of white/light pixels in place (white test as in white_mask)
+
+    Args:
+        data: HxWx4 uint8 RGBA array (modified in place)
+        threshold: Brightness threshold (0-255)
+        by_average: Compare the RGB average instead of every channel against threshold
+        inclusive: Also clear pixels exactly at the threshold
+
+    Returns:
+        int: Number of pixels made transparent
+    """
+    pixels = data.shape[0] * data.shape[1]
+    threshold_alpha = threshold_alpha_kernel() if pixels >= KERNEL_MIN_PIXELS else None
+    if threshold_alpha is not None:
+        return threshold_alpha(data, threshold, by_average, inclusive)
+
+    white_areas = white_mask(data, threshold, by_average, inclusive)
+    data[white_areas, 3] = 0
+    return int(np.count_nonzero(white_areas))
+
+
+def remove_white_background(arr_or_image, threshold=240, by_average=False):
+    """
+    Remove white/light backgrounds by making them transparent
+
+    Args:
+        arr_or_image: PIL Image, or HxWx4 uint8 RGBA array (modified in place)
+        threshold: Brightness threshold (0-255). Pixels brighter than this become transparent.
+        by_average: Compare the RGB average instead of every channel against threshold
+
+    Returns:
+        HxWx4 uint8 RGBA array with the background made transparent
+    """
+    print(f"   🎭 Removing white background (threshold: {threshold})...")
+
+    data = as_rgba_array(arr_or_image)
+    cleared = clear_white_alpha(data, threshold, by_average)
+
+    # Count transparent pixels for feedback
+    percent_transparent = cleared / (data.shape[0] * data.shape[1]) * 100
+    print(f"   ✅ Background removed ({percent_transparent:.1f}% transparent)")
+
+    return data
+
+
+def erode_array(channel, pixels=1):
+    """
+    Morphological erosion of a 2D uint8 array with a (2N+1)x(2N+1) square kernel
+
+    Equivalent to N passes of a 3x3 min filter. Uses OpenCV's SIMD morphology
+    when installed, otherwise one separable row/column minimum with edge replication.
+    """
+    if pixels <= 0:
+        return channel.copy()
+
+    try:
+        import cv2
+    except ImportError:
+        cv2 = None
+
+    if cv2 is not None:
+        kernel = np.ones((2 * pixels + 1, 2 * pixels + 1), np.uint8)
+        return cv2.erode(np.ascontiguousarray(channel), kernel, borderType=cv2.BORDER_REPLICATE)
+
+    height, width = channel.shape
+    padded = np.pad(channel, pixels, mode='edge')
+
+    # Horizontal minimum
+    rows = padded[:, :width].copy()
+    for dx in range(1, 2 * pixels + 1):
+        np.minimum(rows, padded[:, dx:dx + width], out=rows)
+
+    # Vertical minimum
+    eroded = rows[:height].copy()
+    for dy in range(1, 2 * pixels + 1):
+        np.minimum(eroded, rows[dy:dy + height], out=eroded)
+
+    return eroded
@@ -14,14 +14,28 @@ Strategies:
     - stretch: Resize to exact dimensions (may distort)
 
 Dependencies:
-    pip install Pillow
+    pip install Pillow numpy
+    pip install cykooz.resizer  (optional, SIMD-accelerated Lanczos resize)
+    pip install pillow-simd     (optional, drop-in replacement for Pillow)
+    pip install numba           (optional, parallel JIT kernel for --remove-white on very large images)
+    pip install opencv-python-headless  (optional, SIMD erosion for --erode)
 """
 
 import sys
 import os
 import json
+import math
+import mmap
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from PIL import Image, ImageOps
+
+# Shared pixel ops (bg_ops.py) live next to this script
+SCRIPT_DIR = str(Path(__file__).resolve().parent)
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
 
 
 # Strategy constants
@@ -31,6 +45,156 @@ STRATEGIES = {
     'STRETCH': 'stretch'
 }
 
+# Image modes the SIMD resizer can handle directly
+RESIZER_MODES = ('L', 'LA', 'RGB', 'RGBA')
+
+# Integer-reduce large downsizes before Lanczos (visually identical, far fewer samples)
+REDUCING_GAP = 3.0
+
+
+@lru_cache(maxsize=None)
+def simd_resizer():
+    """
+    Optional SIMD Lanczos resizer (Rust fast_image_resize)
+
+    Imported on first resize so usage errors and non-resize commands don't pay for it.
+
+    Returns:
+        cykooz Resizer, or None when cykooz.resizer is not installed (Pillow is used instead)
+    """
+    try:
+        from cykooz.resizer import Resizer, ResizeAlg, FilterType
+    except ImportError:
+        return None
+
+    return Resizer(ResizeAlg.convolution(FilterType.lanczos3))
+
+
+def lanczos_resize(image, size, box=None):
+    """
+    Lanczos resize, using cykooz.resizer when available and Pillow otherwise
+
+    Args:
+        image: PIL Image object
+        size: Target (width, height)
+        box: Optional (left, upper, right, lower) source region to resize
+
+    Returns:
+        PIL Image of the requested size
+    """
+    from PIL import Image
+
+    resizer = simd_resizer()
+    if resizer is None or image.mode not in RESIZER_MODES:
+        return image.resize(size, Image.Resampling.LANCZOS, box=box, reducing_gap=REDUCING_GAP)
+
+    if box is not None:
+        image = image.crop(tuple(round(v) for v in box))
+
+    resized = Image.new(image.mode, size)
+    resizer.resize_pil(image, resized)
+    return resized
+
+
+def contain_size(size, bounds):
+    """
+    Largest size fitting within bounds that keeps the aspect ratio (never upscales)
+
+    Same rounding as Image.thumbnail(): the free side takes whichever of
+    floor/ceil keeps the aspect ratio closest.
+    """
+    width, height = size
+    bound_width, bound_height = bounds
+    if bound_width >= width and bound_height >= height:
+        return size
+
+    aspect = width / height
+    if bound_width / bound_height >= aspect:
+        fit = bound_height * aspect
+        candidates = (math.floor(fit), math.ceil(fit))
+        return (max(min(candidates, key=lambda n: abs(aspect - n / bound_height)), 1), bound_height)
+
+    fit = bound_width / aspect
+    candidates = (math.floor(fit), math.ceil(fit))
+    return (bound_width, max(min(candidates, key=lambda n: 0 if n == 0 else abs(aspect - bound_width / n)), 1))
+
+
+def cover_box(size, target):
+    """Centered source region matching the target aspect ratio"""
+    width, height = size
+    target_ratio = target[0] / target[1]
+
+    if width / height > target_ratio:
+        crop_width = height * target_ratio
+        return ((width - crop_width) / 2, 0, (width + crop_width) / 2, height)
+
+    crop_height = width / target_ratio
+    return (0, (height - crop_height) / 2, width, (height + crop_height) / 2)
+
+
+@contextmanager
+def open_image_mapped(input_path):
+    """
+    Open an image through a read-only memory map
+
+    Pillow reads straight from the mapped pages instead of double-buffering
+    through stdio. The map is released when the context exits, so load() the
+    image inside it and only save after leaving it (the output may overwrite the
+    input, and Windows refuses to write to a file with an open mapping).
+    """
+    from PIL import Image
+
+    with open(input_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with Image.open(mapped) as image:
+            yield image
+
+
+def resize_contain_centered(image, target_width, target_height):
+    """Resize to fit within bounds, center with transparent padding"""
+    from PIL import Image
+
+    fit_size = contain_size(image.size, (target_width, target_height))
+    if fit_size != image.size:
+        image = lanczos_resize(image, fit_size)
+
+    # Create transparent canvas
+    if image.mode == 'RGBA':
+        canvas = Image.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
+    else:
+        canvas = Image.new('RGB', (target_width, target_height), (255, 255, 255))
+
+    # Center image on canvas
+    offset = ((target_width - image.width) // 2, (target_height - image.height) // 2)
+    canvas.paste(image, offset)
+    return canvas
+
+
+def resize_cover_crop(image, target_width, target_height):
+    """Resize to cover bounds, crop excess from center"""
+    box = cover_box(image.size, (target_width, target_height))
+    return lanczos_resize(image, (target_width, target_height), box)
+
+
+def resize_stretch(image, target_width, target_height):
+    """Resize to exact dimensions (may distort aspect ratio)"""
+    return lanczos_resize(image, (target_width, target_height))
+
+
+# Strategy name -> resize function taking (image, target_width, target_height)
+STRATEGY_FUNCTIONS = {
+    STRATEGIES['CONTAIN_CENTERED']: resize_contain_centered,
+    STRATEGIES['COVER_CROP']: resize_cover_crop,
+    STRATEGIES['STRETCH']: resize_stretch
+}
+
+
+def save_transparent(image, output_path):
+    """Save a transparent image as lossless WebP for .webp paths, PNG otherwise"""
+    if Path(output_path).suffix.lower() == '.webp':
+        image.save(output_path, 'WEBP', lossless=True, method=4, quality=100)
+    else:
+        image.save(output_path, 'PNG', optimize=True)
+
 
 def resize_image(input_path, output_path, target_width, target_height, strategy='contain-centered'):
     """
@@ -46,35 +210,63 @@ def resize_image(input_path, output_path, target_width, target_height, strategy=
     Returns:
         dict: Result object with metadata
     """
-    image = Image.open(input_path)
+    with open_image_mapped(input_path) as image:
+        original_size = load_for_resize(image, target_width, target_height, strategy)
+
+    return resize_image_from_pil(image, output_path, target_width, target_height, strategy, input_path, original_size)
+
+
+def load_for_resize(image, target_width, target_height, strategy):
+    """
+    Decode an opened image once, letting oversized JPEGs decode at reduced DCT scale
+
+    Args:
+        image: Freshly opened (not yet loaded) PIL Image object
+        target_width: Target width in pixels
+        target_height: Target height in pixels
+        strategy: Resize strategy (contain-centered, cover-crop, stretch)
+
+    Returns:
+        tuple: Original (width, height) before any reduced-scale decode
+    """
     original_size = image.size
-    original_format = image.format
 
-    if strategy == STRATEGIES['CONTAIN_CENTERED']:
-        # Resize to fit within bounds, center with transparent padding
-        image.thumbnail((target_width, target_height), Image.Resampling.LANCZOS)
+    if image.format == 'JPEG' and strategy in (STRATEGIES['CONTAIN_CENTERED'], STRATEGIES['COVER_CROP']):
+        # Keep 2x headroom over the target so Lanczos still filters real detail
+        image.draft('RGB', (target_width * 2, target_height * 2))
+
+    image.load()
+    return original_size
 
-        # Create transparent canvas
-        if image.mode == 'RGBA':
-            canvas = Image.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
-        else:
-            canvas = Image.new('RGB', (target_width, target_height), (255, 255, 255))
 
-        # Center image on canvas
-        offset = ((target_width - image.width) // 2, (target_height - image.height) // 2)
-        canvas.paste(image, offset)
-        image = canvas
+def resize_image_from_pil(image, output_path, target_width, target_height, strategy='contain-centered',
+                          input_path=None, original_size=None):
+    """
+    Resize an already-decoded image using the specified strategy
+
+    Args:
+        image: PIL Image object (decoded once by the caller)
+        output_path: Path to save output image
+        target_width: Target width in pixels
+        target_height: Target height in pixels
+        strategy: Resize strategy (contain-centered, cover-crop, stretch)
+        input_path: Source path, reported in the result metadata
+        original_size: Source (width, height) if decoded at reduced scale (defaults to image.size)
 
-    elif strategy == STRATEGIES['COVER_CROP']:
-        # Resize to cover bounds, crop excess from center
-        image = ImageOps.fit(image, (target_width, target_height), Image.Resampling.LANCZOS, centering=(0.5, 0.5))
+    Returns:
+        dict: Result object with metadata
+    """
+    from PIL import Image
 
-    elif strategy == STRATEGIES['STRETCH']:
-        # Resize to exact dimensions (may distort aspect ratio)
-        image = image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+    original_size = original_size or image.size
+    original_format = image.format
 
-    else:
-        raise ValueError(f"Unknown resize strategy: {strategy}")
+    try:
+        resize_fn = STRATEGY_FUNCTIONS[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown resize strategy: {strategy}") from None
+
+    image = resize_fn(image, target_width, target_height)
 
     # Determine output format from file extension
     ext = Path(output_path).suffix.lower()
@@ -83,7 +275,7 @@ def resize_image(input_path, output_path, target_width, target_height, strategy=
         if image.mode == 'RGBA':
             # Convert RGBA to RGB for JPEG
             rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-            rgb_image.paste(image, mask=image.split()[3] if image.mode == 'RGBA' else None)
+            rgb_image.paste(image, mask=image.getchannel('A'))
             image = rgb_image
         image.save(output_path, 'JPEG', quality=85, optimize=True)
     elif ext == '.png':
@@ -126,6 +318,8 @@ def center_icon(input_path, output_path, canvas_size, padding=0.1):
     Returns:
         dict: Result object with metadata
     """
+    from PIL import Image
+
     image = Image.open(input_path)
     original_size = image.size
 
@@ -133,7 +327,9 @@ def center_icon(input_path, output_path, canvas_size, padding=0.1):
     max_icon_size = int(canvas_size * (1 - padding * 2))
 
     # Resize the icon to fit within max size while maintaining aspect ratio
-    image.thumbnail((max_icon_size, max_icon_size), Image.Resampling.LANCZOS)
+    fit_size = contain_size(image.size, (max_icon_size, max_icon_size))
+    if fit_size != image.size:
+        image = lanczos_resize(image, fit_size)
 
     # Create transparent canvas
     canvas = Image.new('RGBA', (canvas_size, canvas_size), (0, 0, 0, 0))
@@ -145,8 +341,8 @@ def center_icon(input_path, output_path, canvas_size, padding=0.1):
     # Paste icon on canvas
     canvas.paste(image, (left, top), image if image.mode == 'RGBA' else None)
 
-    # Save as PNG
-    canvas.save(output_path, 'PNG', optimize=True)
+    # Save as PNG (or lossless WebP)
+    save_transparent(canvas, output_path)
 
     output_size = os.path.getsize(output_path)
 
@@ -180,16 +376,16 @@ def remove_white(input_path, output_path, threshold=240):
     Returns:
         dict: Result object with metadata
     """
-    image = Image.open(input_path).convert('RGBA')
-    pixels = image.load()
+    from PIL import Image
+    import bg_ops
+
+    data = bg_ops.load_rgba_array(input_path)
 
-    for y in range(image.height):
-        for x in range(image.width):
-            r, g, b, a = pixels[x, y]
-            if r >= threshold and g >= threshold and b >= threshold:
-                pixels[x, y] = (r, g, b, 0)
+    # Make near-white pixels (every channel at or above threshold) transparent in a single pass
+    bg_ops.clear_white_alpha(data, threshold, inclusive=True)
+    image = Image.fromarray(data, 'RGBA')
 
-    image.save(output_path, 'PNG', optimize=True)
+    save_transparent(image, output_path)
 
     output_size = os.path.getsize(output_path)
 
@@ -208,6 +404,8 @@ def erode_alpha(input_path, output_path, pixels=1):
     """
     Erode alpha channel to remove white halos
 
+    Morphological erosion of the alpha channel only; RGB and image size are untouched.
+
     Args:
         input_path: Path to input image
         output_path: Path to save output image
@@ -216,25 +414,13 @@ def erode_alpha(input_path, output_path, pixels=1):
     Returns:
         dict: Result object with metadata
     """
-    image = Image.open(input_path).convert('RGBA')
-    original_size = image.size
+    from PIL import Image
+    import bg_ops
 
-    # Simple erosion: resize down then up
-    erosion_factor = 1 - (pixels * 2 / min(image.width, image.height))
-    shrunk_width = int(image.width * erosion_factor)
-    shrunk_height = int(image.height * erosion_factor)
+    data = bg_ops.load_rgba_array(input_path)
+    data[:, :, 3] = bg_ops.erode_array(data[:, :, 3], pixels)
 
-    # Resize down
-    shrunk = image.resize((shrunk_width, shrunk_height), Image.Resampling.LANCZOS)
-
-    # Create transparent canvas of original size
-    canvas = Image.new('RGBA', original_size, (0, 0, 0, 0))
-
-    # Center the shrunk image
-    offset = ((original_size[0] - shrunk_width) // 2, (original_size[1] - shrunk_height) // 2)
-    canvas.paste(shrunk, offset, shrunk)
-
-    canvas.save(output_path, 'PNG', optimize=True)
+    save_transparent(Image.fromarray(data, 'RGBA'), output_path)
 
     output_size = os.path.getsize(output_path)
 
@@ -256,6 +442,7 @@ def threshold_to_black(input_path, output_path, alpha_threshold=10):
 
     Use this after background removal to create perfect black masks that game engines
     can tint with any color without artifacts from "almost black" or colored pixels.
+    Pixels at or below the alpha threshold are cleared to fully transparent.
 
     Args:
         input_path: Path to input image (must have alpha channel)
@@ -265,22 +452,21 @@ def threshold_to_black(input_path, output_path, alpha_threshold=10):
     Returns:
         dict: Result object with metadata
     """
-    image = Image.open(input_path).convert('RGBA')
-    pixels = image.load()
-
-    pixels_converted = 0
+    from PIL import Image
 
-    for y in range(image.height):
-        for x in range(image.width):
-            r, g, b, a = pixels[x, y]
+    with Image.open(input_path) as source:
+        rgba = source if source.mode == 'RGBA' else source.convert('RGBA')
+        alpha = rgba.getchannel('A')
 
-            # If pixel is not transparent (alpha above threshold)
-            if a > alpha_threshold:
-                # Convert to pure black, preserve alpha
-                pixels[x, y] = (0, 0, 0, a)
-                pixels_converted += 1
+    # Keep alpha above threshold, clear the rest (single 256-entry LUT pass)
+    lut = [0 if value <= alpha_threshold else value for value in range(256)]
+    alpha = alpha.point(lut)
+    pixels_converted = sum(alpha.histogram()[alpha_threshold + 1:])
 
-    image.save(output_path, 'PNG', optimize=True)
+    # Pure black everywhere, shaped by the thresholded alpha
+    image = Image.new('RGBA', alpha.size, (0, 0, 0, 255))
+    image.putalpha(alpha)
+    save_transparent(image, output_path)
 
     output_size = os.path.getsize(output_path)
 
@@ -297,10 +483,87 @@ def threshold_to_black(input_path, output_path, alpha_threshold=10):
     }
 
 
+def copy_unresized(image, input_path, output_path, strategy):
+    """
+    Copy an asset that already matches its target size (no decode or re-encode)
+
+    Args:
+        image: Opened (header-only) PIL Image object for the input
+        input_path: Path to input image
+        output_path: Path to save output image (may be the input itself)
+        strategy: Resize strategy that would have been applied
+
+    Returns:
+        dict: Result object with metadata
+    """
+    if not os.path.exists(output_path) or not os.path.samefile(input_path, output_path):
+        shutil.copyfile(input_path, output_path)
+
+    return {
+        'success': True,
+        'input': {
+            'path': input_path,
+            'width': image.width,
+            'height': image.height,
+            'format': image.format
+        },
+        'output': {
+            'path': output_path,
+            'width': image.width,
+            'height': image.height,
+            'size': os.path.getsize(output_path)
+        },
+        'strategy': strategy,
+        'skipped': 'Already at target size'
+    }
+
+
+def resize_asset(input_path, output_path, dimensions, strategy):
+    """
+    Decode and resize a single batch asset (runs in a worker process)
+
+    Assets already at the target size with a matching file extension are copied
+    as-is instead of being decoded, resized and re-encoded.
+
+    Args:
+        input_path: Path to input image
+        output_path: Path to save output image
+        dimensions: Dict with target 'width' and 'height'
+        strategy: Resize strategy (contain-centered, cover-crop, stretch)
+
+    Returns:
+        dict: Result object with metadata, or error details on failure
+    """
+    try:
+        # Decode inside the mapping; copy/save only once it is released
+        with open_image_mapped(input_path) as image:
+            same_extension = Path(input_path).suffix.lower() == Path(output_path).suffix.lower()
+            unresized = same_extension and image.size == (dimensions['width'], dimensions['height'])
+            if not unresized:
+                original_size = load_for_resize(image, dimensions['width'], dimensions['height'], strategy)
+
+        if unresized:
+            return copy_unresized(image, input_path, output_path, strategy)
+
+        return resize_image_from_pil(
+            image,
+            output_path,
+            dimensions['width'],
+            dimensions['height'],
+            strategy,
+            input_path,
+            original_size
+        )
+    except Exception as error:
+        return {'success': False, 'error': str(error), 'path': input_path}
+
+
 def batch_resize(config_path, input_folder, output_folder):
     """
     Batch resize all assets in a folder according to config
 
+    Assets are independent, so they are resized in parallel worker processes.
+
     Args:
         config_path: Path to .asset-gen-config.json
         input_folder: Folder containing assets to resize
@@ -313,6 +576,7 @@ def batch_resize(config_path, input_folder, output_folder):
         config = json.load(f)
 
     results = {}
+    jobs = {}
 
     for asset_type, asset_config in config['assetTypes'].items():
         if asset_type.startswith('_'):
@@ -325,6 +589,10 @@ def batch_resize(config_path, input_folder, output_folder):
             results[asset_type] = {'success': False, 'error': 'File not found', 'path': input_path}
             continue
 
+        if 'dimensions' not in asset_config:
+            results[asset_type] = {'success': False, 'error': 'Missing dimensions', 'path': input_path}
+            continue
+
         # Determine strategy based on asset type
         strategy = STRATEGIES['CONTAIN_CENTERED']
         if 'texture' in asset_config['filename'] or 'background' in asset_config['filename']:
@@ -338,17 +606,19 @@ def batch_resize(config_path, input_folder, output_folder):
                 elif 'cover-crop' in step:
                     strategy = STRATEGIES['COVER_CROP']
 
-        try:
-            result = resize_image(
-                input_path,
-                output_path,
-                asset_config['dimensions']['width'],
-                asset_config['dimensions']['height'],
-                strategy
-            )
-            results[asset_type] = result
-        except Exception as error:
-            results[asset_type] = {'success': False, 'error': str(error), 'path': input_path}
+        # Reserve the slot so results keep config order
+        results[asset_type] = None
+        jobs[asset_type] = (input_path, output_path, asset_config['dimensions'], strategy)
+
+    if len(jobs) <= 1:
+        for asset_type, args in jobs.items():
+            results[asset_type] = resize_asset(*args)
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        futures = {executor.submit(resize_asset, *args): asset_type for asset_type, args in jobs.items()}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
 
     return results
 
@@ -357,7 +627,7 @@ def main():
     """Main CLI interface"""
     args = sys.argv[1:]
 
-    if len(args) < 4 and args[0] not in ['--batch', '--remove-white', '--center', '--erode', '--threshold-black']:
+    if not args or (len(args) < 4 and args[0] not in ['--batch', '--remove-white', '--center', '--erode', '--threshold-black']):
         print("""
 Image Resize Helper - Project Agnostic Utility
 
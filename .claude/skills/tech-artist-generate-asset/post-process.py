@@ -6,17 +6,24 @@ Handles background removal, alpha erosion, and compression for generated images.
 **Project-agnostic:** Reads asset configuration from .asset-gen-config.json
 
 Usage: python post-process.py <inputPath> <outputPath> <assetType> [configPath]
+       python post-process.py --manifest <manifestPath> [configPath]
 
 Dependencies:
     pip install Pillow numpy
+    pip install pillow-simd  (optional, drop-in replacement for Pillow)
+    pip install opencv-python-headless  (optional, SIMD alpha erosion)
 """
 
 import sys
 import os
 import json
+from itertools import repeat
 from pathlib import Path
-from PIL import Image, ImageFilter
-import numpy as np
+
+# Shared pixel ops (bg_ops.py) live next to this script
+SCRIPT_DIR = str(Path(__file__).resolve().parent)
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
 
 # Fix Windows console encoding for emoji support
 if sys.platform == 'win32':
@@ -27,6 +34,20 @@ if sys.platform == 'win32':
         # Fallback: set environment variable for subprocess compatibility
         os.environ['PYTHONIOENCODING'] = 'utf-8'
 
+# Fallback asset spec when no config file is available
+DEFAULT_ASSET_CONFIG = {
+    'format': 'PNG',
+    'sizeTarget': '50KB',
+    'needsTransparency': True,
+    'dimensions': None
+}
+
+# Size target suffixes (e.g. '150KB') -> byte multiplier
+SIZE_UNITS = {
+    'KB': 1024,
+    'MB': 1024 * 1024
+}
+
 
 def load_config(config_path='.asset-gen-config.json'):
     """Load asset configuration from JSON file"""
@@ -49,79 +70,45 @@ def parse_size_target(size_str):
         return None
 
     size_str = str(size_str).upper().strip()
-    if size_str.endswith('KB'):
-        return int(size_str[:-2]) * 1024
-    elif size_str.endswith('MB'):
-        return int(size_str[:-2]) * 1024 * 1024
-    else:
-        return int(size_str)
+    multiplier = SIZE_UNITS.get(size_str[-2:])
+    if multiplier:
+        return int(size_str[:-2]) * multiplier
+    return int(size_str)
 
 
 def get_asset_config(config, asset_type):
     """Get configuration for specific asset type"""
     if not config or 'assetTypes' not in config:
-        return {
-            'format': 'PNG',
-            'sizeTarget': '50KB',
-            'needsTransparency': True
-        }
+        return dict(DEFAULT_ASSET_CONFIG)
 
     asset_spec = config['assetTypes'].get(asset_type, {})
 
-    # Extract from restructured config (v1.2.0+)
-    if 'output' in asset_spec:
-        format_type = asset_spec['output'].get('format', 'PNG')
-        size_target = asset_spec['output'].get('sizeTarget', '50KB')
-    else:
-        # Fallback for old config structure
-        format_type = asset_spec.get('format', 'PNG')
-        size_target = asset_spec.get('sizeTarget', '50KB')
+    # Extract from restructured config (v1.2.0+), falling back to old config structure
+    output_spec = asset_spec['output'] if 'output' in asset_spec else asset_spec
+    format_type = output_spec.get('format', 'PNG')
+    size_target = output_spec.get('sizeTarget', '50KB')
 
-    # Determine if transparency is needed based on format
-    needs_transparency = format_type == 'PNG'
+    # Determine if transparency is needed based on format (WEBP assets opt in explicitly)
+    needs_transparency = output_spec.get('needsTransparency', format_type == 'PNG')
 
     return {
         'format': format_type,
         'sizeTarget': size_target,
-        'needsTransparency': needs_transparency
+        'needsTransparency': needs_transparency,
+        'dimensions': output_spec.get('dimensions')
     }
 
 
-def erode_alpha_channel(image, pixels=1):
-    """
-    Erode alpha channel to remove white halos
-
-    This shrinks the alpha channel by N pixels to eliminate anti-aliasing artifacts
-    that appear as white/gray edges around transparent images.
-    """
-    print(f"   🔧 Eroding alpha channel by {pixels}px to remove halos...")
-
-    if image.mode != 'RGBA':
-        image = image.convert('RGBA')
-
-    # Get alpha channel
-    alpha = image.split()[3]
-
-    # Erode alpha channel (makes edges more transparent)
-    for _ in range(pixels):
-        alpha = alpha.filter(ImageFilter.MinFilter(3))
-
-    # Recombine channels
-    r, g, b, _ = image.split()
-    eroded = Image.merge('RGBA', (r, g, b, alpha))
-
-    print("   ✅ Alpha erosion complete")
-    return eroded
-
-
 def compress_jpeg(image, quality=85):
     """Compress JPEG image"""
+    from PIL import Image
+
     print(f"   🗜️  Compressing JPEG (quality: {quality}%)...")
 
     if image.mode == 'RGBA':
         # Convert RGBA to RGB for JPEG
         rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-        rgb_image.paste(image, mask=image.split()[3])
+        rgb_image.paste(image, mask=image.getchannel('A'))
         image = rgb_image
     elif image.mode != 'RGB':
         image = image.convert('RGB')
@@ -139,46 +126,6 @@ def optimize_png(image, compression_level=9):
     return image, compression_level
 
 
-def remove_white_background(image, threshold=240):
-    """
-    Remove white/light backgrounds by making them transparent (fallback method)
-
-    Args:
-        image: PIL Image object
-        threshold: Brightness threshold (0-255). Pixels brighter than this become transparent.
-
-    Returns:
-        PIL Image with transparent background
-    """
-    print(f"   🎭 Removing white background (threshold: {threshold})...")
-
-    # Convert to RGBA if not already
-    if image.mode != 'RGBA':
-        image = image.convert('RGBA')
-
-    # Convert to numpy array
-    data = np.array(image)
-
-    # Get RGB channels
-    r, g, b, a = data[:, :, 0], data[:, :, 1], data[:, :, 2], data[:, :, 3]
-
-    # Make bright pixels transparent
-    white_areas = (r > threshold) & (g > threshold) & (b > threshold)
-    data[white_areas, 3] = 0
-
-    # Convert back to PIL Image
-    result = Image.fromarray(data, 'RGBA')
-
-    # Count transparent pixels for feedback
-    transparent_pixels = np.sum(white_areas)
-    total_pixels = image.width * image.height
-    percent_transparent = (transparent_pixels / total_pixels) * 100
-
-    print(f"   ✅ Background removed ({percent_transparent:.1f}% transparent)")
-
-    return result
-
-
 def remove_background_replicate(input_path, model_version):
     """
     Remove background using Replicate's rembg model
@@ -208,37 +155,39 @@ def remove_background_replicate(input_path, model_version):
     return None  # Fallback to local method
 
 
-def remove_background_simple(image, threshold=240, use_replicate=False, replicate_model=None):
+def process_transparency(data, threshold=240, erosion_pixels=1):
     """
-    Remove background with automatic fallback strategy
+    Local threshold-based background removal + alpha erosion on a single pixel buffer
 
-    Strategy:
-    1. If use_replicate=True, attempt Replicate rembg (requires Claude Code MCP)
-    2. Fallback to local threshold-based removal
+    Fallback for Replicate rembg; runs both steps without intermediate PIL round-trips.
 
     Args:
-        image: PIL Image object
-        threshold: Brightness threshold for fallback method (default 240)
-        use_replicate: Whether to attempt Replicate rembg first
-        replicate_model: Replicate model version ID
+        data: HxWx4 uint8 RGBA array (modified in place)
+        threshold: Brightness threshold (0-255). Pixels brighter than this become transparent.
+        erosion_pixels: Number of pixels to erode the alpha channel by
 
     Returns:
-        PIL Image with transparent background
+        The same array, with background removed and alpha eroded
     """
-    # Attempt Replicate if requested
-    if use_replicate and replicate_model:
-        print('   🚀 Trying Replicate rembg (requires Claude Code MCP)...')
-        print('   ℹ️  Falling back to local method (Replicate MCP not available in this context)')
+    import bg_ops
 
-    # Fallback to local threshold-based removal
     print('   🏠 Using local background removal (threshold-based)')
-    image = remove_white_background(image, threshold)
 
-    return image
+    # Make bright pixels transparent
+    bg_ops.remove_white_background(data, threshold)
+
+    # Erode alpha to remove white halos
+    print(f"   🔧 Eroding alpha channel by {erosion_pixels}px to remove halos...")
+    data[:, :, 3] = bg_ops.erode_array(data[:, :, 3], erosion_pixels)
+    print("   ✅ Alpha erosion complete")
+
+    return data
 
 
 def post_process_asset(input_path, output_path, asset_type, config=None):
     """Main post-processing pipeline"""
+    from PIL import Image
+
     print(f"\n🔧 Post-processing {asset_type}...")
 
     # Read input image
@@ -254,19 +203,54 @@ def post_process_asset(input_path, output_path, asset_type, config=None):
 
     print(f"   📋 Format: {asset_config['format']}, Target: {size_target_str}")
 
+    # Opaque assets larger than their configured dimensions are resized to them (cover-crop)
+    dimensions = asset_config['dimensions']
+    target = (dimensions['width'], dimensions['height']) if dimensions else None
+    if (not needs_transparency and target
+            and image.width >= target[0] and image.height >= target[1] and image.size != target):
+        from PIL import ImageOps
+
+        if image.format == 'JPEG':
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale, keeping 2x headroom over the
+            # target (as image-resize-helper.py does) so Lanczos still filters real detail
+            full_size = image.size
+            image.draft('RGB', (target[0] * 2, target[1] * 2))
+            if image.size != full_size:
+                print(f"   ⚡ Draft decoding {full_size[0]}x{full_size[1]} at {image.width}x{image.height}")
+
+        print(f"   📐 Resizing to {target[0]}x{target[1]} (cover-crop)...")
+        image = ImageOps.fit(image, target, Image.Resampling.LANCZOS)
+
     if needs_transparency:
         # PNG assets with transparency
         print('   🎭 Processing transparency...')
-        image = remove_background_simple(image)
 
-        # Erode alpha to remove white halos
-        image = erode_alpha_channel(image, 1)
+        # Background removal and halo erosion in one pass over a single in-memory buffer
+        import bg_ops
 
-        # Optimize PNG
-        image, compression = optimize_png(image, 9)
+        image = Image.fromarray(process_transparency(bg_ops.as_rgba_array(image), 240, 1), 'RGBA')
 
-        # Save as PNG
-        image.save(output_path, 'PNG', optimize=True, compress_level=compression)
+        if asset_config['format'] == 'WEBP':
+            # Lossless WebP: smaller than PNG and cheaper to encode
+            print('   🗜️  Encoding lossless WebP...')
+            image.save(output_path, 'WEBP', lossless=True, method=4, quality=100)
+        else:
+            # Optimize PNG (default zlib level; maximum compression only if over budget)
+            image, compression = optimize_png(image, 6)
+
+            # Save as PNG
+            image.save(output_path, 'PNG', compress_level=compression)
+
+            if size_target and os.path.getsize(output_path) > size_target:
+                print('   🗜️  Over target, re-saving with maximum PNG compression...')
+                image.save(output_path, 'PNG', optimize=True, compress_level=9)
+
+    elif asset_config['format'] == 'WEBP':
+        # Opaque WebP assets
+        print('   🗜️  Compressing WebP (quality: 85%)...')
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGB')
+        image.save(output_path, 'WEBP', quality=85, method=6)
 
     else:
         # JPEG assets
@@ -293,20 +277,80 @@ def post_process_asset(input_path, output_path, asset_type, config=None):
     return output_path
 
 
+def load_manifest(manifest_path):
+    """
+    Load a batch manifest: a JSON list of {"inputPath", "outputPath", "assetType"} objects
+
+    Returns:
+        list of (input_path, output_path, asset_type) tuples
+    """
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    return [(entry['inputPath'], entry['outputPath'], entry['assetType']) for entry in manifest]
+
+
+def process_manifest_entry(input_path, output_path, asset_type, config=None):
+    """
+    Post-process a single manifest asset (runs in a worker process)
+
+    Returns:
+        dict: Result object, or error details on failure
+    """
+    try:
+        post_process_asset(input_path, output_path, asset_type, config)
+        return {'success': True, 'assetType': asset_type, 'path': output_path}
+    except Exception as error:
+        return {'success': False, 'assetType': asset_type, 'error': str(error), 'path': input_path}
+
+
+def process_manifest(entries, config=None):
+    """
+    Post-process many assets, in parallel worker processes
+
+    Assets are independent, so each worker loads PIL/NumPy once and processes
+    its share of the manifest. A failing asset doesn't stop the others.
+
+    Args:
+        entries: list of (input_path, output_path, asset_type) tuples
+        config: Loaded asset configuration (None for defaults)
+
+    Returns:
+        list: Result for each asset, in manifest order
+    """
+    if len(entries) <= 1:
+        return [process_manifest_entry(*entry, config) for entry in entries]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    input_paths, output_paths, asset_types = zip(*entries)
+    with ProcessPoolExecutor(max_workers=min(len(entries), os.cpu_count() or 1)) as executor:
+        return list(executor.map(process_manifest_entry, input_paths, output_paths, asset_types, repeat(config)))
+
+
 def main():
     """Main execution"""
-    if len(sys.argv) < 4:
+    batch = len(sys.argv) > 2 and sys.argv[1] == '--manifest'
+
+    if len(sys.argv) < 4 and not batch:
         print('❌ Usage: python post-process.py <inputPath> <outputPath> <assetType> [configPath]')
+        print('         python post-process.py --manifest <manifestPath> [configPath]')
         print('   ')
         print('   configPath: Optional path to .asset-gen-config.json (default: .asset-gen-config.json)')
+        print('   manifestPath: JSON list of {"inputPath", "outputPath", "assetType"} objects,')
+        print('                 processed in parallel')
         print('   ')
         print('   The script will read asset specifications from the config file.')
         sys.exit(1)
 
-    input_path = sys.argv[1]
-    output_path = sys.argv[2]
-    asset_type = sys.argv[3]
-    config_path = sys.argv[4] if len(sys.argv) > 4 else '.asset-gen-config.json'
+    if batch:
+        manifest_path = sys.argv[2]
+        config_path = sys.argv[3] if len(sys.argv) > 3 else '.asset-gen-config.json'
+    else:
+        input_path = sys.argv[1]
+        output_path = sys.argv[2]
+        asset_type = sys.argv[3]
+        config_path = sys.argv[4] if len(sys.argv) > 4 else '.asset-gen-config.json'
 
     # Load configuration
     config = load_config(config_path)
@@ -315,8 +359,21 @@ def main():
         print('⚠️  Running without config file - using defaults')
 
     try:
-        post_process_asset(input_path, output_path, asset_type, config)
-        print('\n✅ Post-processing complete!')
+        if batch:
+            results = process_manifest(load_manifest(manifest_path), config)
+            failures = [result for result in results if not result['success']]
+
+            for failure in failures:
+                print(f"\n❌ {failure['assetType']} failed ({failure['path']}): {failure['error']}")
+
+            if failures:
+                print(f'\n❌ Post-processing failed for {len(failures)} of {len(results)} assets')
+                sys.exit(1)
+
+            print(f'\n✅ Post-processing complete! ({len(results)} assets)')
+        else:
+            post_process_asset(input_path, output_path, asset_type, config)
+            print('\n✅ Post-processing complete!')
     except Exception as error:
         print(f'\n❌ Post-processing failed: {error}')
         import traceback
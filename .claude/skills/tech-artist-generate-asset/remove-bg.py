@@ -14,12 +14,17 @@ Examples:
 
 Dependencies:
     pip install Pillow numpy
+    pip install numba           (optional, parallel JIT kernel for very large images)
 """
 
 import sys
 import os
-from PIL import Image
-import numpy as np
+from pathlib import Path
+
+# Shared pixel ops (bg_ops.py) live next to this script
+SCRIPT_DIR = str(Path(__file__).resolve().parent)
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
 
 
 def remove_white_background(image, threshold=240):
@@ -27,45 +32,17 @@ def remove_white_background(image, threshold=240):
     Remove white/light backgrounds by making them transparent
 
     Args:
-        image: PIL Image object
+        image: PIL Image object, or HxWx4 uint8 RGBA array (modified in place)
         threshold: Brightness threshold (0-255). Pixels brighter than this become transparent.
 
     Returns:
         PIL Image with transparent background
     """
-    print(f"   🎭 Removing background (threshold: {threshold})...")
-
-    # Convert to RGBA if not already
-    if image.mode != 'RGBA':
-        image = image.convert('RGBA')
-
-    # Convert to numpy array
-    data = np.array(image)
-
-    # Get RGB channels
-    r, g, b, a = data[:, :, 0], data[:, :, 1], data[:, :, 2], data[:, :, 3]
-
-    # Calculate brightness (average of RGB)
-    brightness = (r.astype(float) + g.astype(float) + b.astype(float)) / 3.0
-
-    # Make bright pixels transparent
-    mask = brightness > threshold
-    a[mask] = 0
-
-    # Update alpha channel
-    data[:, :, 3] = a
-
-    # Convert back to PIL Image
-    result = Image.fromarray(data, 'RGBA')
-
-    # Count transparent pixels
-    transparent_pixels = np.sum(mask)
-    total_pixels = image.width * image.height
-    percent_transparent = (transparent_pixels / total_pixels) * 100
+    from PIL import Image
+    import bg_ops
 
-    print(f"   ✅ Background removed ({percent_transparent:.1f}% transparent)")
-
-    return result
+    # Brightness = RGB average; fromarray wraps the modified array without another copy
+    return Image.fromarray(bg_ops.remove_white_background(image, threshold, by_average=True), 'RGBA')
 
 
 def remove_background_replicate(image_path):
@@ -81,6 +58,8 @@ def remove_background_replicate(image_path):
     Returns:
         PIL Image with transparent background
     """
+    from PIL import Image
+
     print("   ⚠️  Replicate rembg not implemented in this script")
     print("   💡 Use MCP server: mcp__replicate__create_predictions with model 'cjwbw/rembg'")
     print("   ℹ️  Falling back to simple color-based removal...")
@@ -96,10 +75,15 @@ def remove_background(input_path, output_path, threshold=240, use_replicate=Fals
 
     Args:
         input_path: Path to input image
-        output_path: Path to save output image
+        output_path: Path to save output image, or None to skip saving (in-memory chaining)
         threshold: Brightness threshold for color-based removal
         use_replicate: Whether to use Replicate rembg (requires MCP)
+
+    Returns:
+        PIL Image with transparent background
     """
+    import bg_ops
+
     print(f"\n🎭 Removing background from {os.path.basename(input_path)}...")
 
     # Read input
@@ -110,16 +94,21 @@ def remove_background(input_path, output_path, threshold=240, use_replicate=Fals
     if use_replicate:
         image = remove_background_replicate(input_path)
     else:
-        image = Image.open(input_path)
-        image = remove_white_background(image, threshold)
+        # Decode into one writable array and release the PIL buffer before processing
+        image = remove_white_background(bg_ops.load_rgba_array(input_path), threshold)
 
-    # Save output
-    image.save(output_path, 'PNG', optimize=True, compress_level=9)
+    if output_path is None:
+        return image
+
+    # Save output (usually an intermediate for post-process.py, so default zlib level rather than 9)
+    image.save(output_path, 'PNG', compress_level=6)
 
     output_size = os.path.getsize(output_path)
     print(f"   💾 Output size: {round(output_size / 1024)}KB")
     print(f"   ✅ Saved to {output_path}")
 
+    return image
+
 
 def main():
     """Main execution"""
@@ -13,179 +13,215 @@ Dependencies:
 
 import sys
 import json
-import random
-from PIL import Image
-import numpy as np
 
 
-def sample_image_colors(image_path, sample_count=100):
-    """Sample random pixels from an image"""
-    image = Image.open(image_path).convert('RGB')
-    pixels = list(image.getdata())
+def sample_image_colors(image_path, sample_count=100, rng=None):
+    """Sample random pixels from an image as an (N, 3) uint8 array (rng: optional np.random.Generator)"""
+    import numpy as np
+    from PIL import Image
 
-    samples = []
-    for _ in range(min(sample_count, len(pixels))):
-        r, g, b = random.choice(pixels)
-        samples.append({'r': r, 'g': g, 'b': b})
+    with Image.open(image_path) as image:
+        # Skip the convert() copy when already RGB
+        rgb = image if image.mode == 'RGB' else image.convert('RGB')
+        pixels = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
 
-    return samples
+    # Draw all sample indices in one call, then gather them in one indexing op
+    rng = rng if rng is not None else np.random.default_rng()
+    indices = rng.integers(0, pixels.shape[0], size=min(sample_count, pixels.shape[0]), endpoint=False)
+    return pixels[indices]
 
 
-def average_colors(samples):
-    """Calculate average color from samples"""
-    r_sum = sum(s['r'] for s in samples)
-    g_sum = sum(s['g'] for s in samples)
-    b_sum = sum(s['b'] for s in samples)
-
-    count = len(samples)
-    return {
-        'r': round(r_sum / count),
-        'g': round(g_sum / count),
-        'b': round(b_sum / count)
-    }
+def get_saturation(colors):
+    """Calculate color saturation (0-1) of an RGB color or (N, 3) array of colors"""
+    import numpy as np
 
+    colors = np.asarray(colors, dtype=np.int16)
+    max_val = colors.max(axis=-1)
+    min_val = colors.min(axis=-1)
+    return np.where(max_val == 0, 0, (max_val - min_val) / np.maximum(max_val, 1))
 
-def get_saturation(rgb):
-    """Calculate color saturation (0-1)"""
-    max_val = max(rgb['r'], rgb['g'], rgb['b'])
-    min_val = min(rgb['r'], rgb['g'], rgb['b'])
-    return 0 if max_val == 0 else (max_val - min_val) / max_val
 
+def get_brightness(colors):
+    """Calculate color brightness (0-255) of an RGB color or (N, 3) array of colors"""
+    import numpy as np
 
-def get_brightness(rgb):
-    """Calculate color brightness (0-255)"""
-    return (rgb['r'] + rgb['g'] + rgb['b']) / 3
+    return np.asarray(colors, dtype=np.int16).sum(axis=-1) / 3
 
 
 def find_brightest_color(samples):
-    """Find the brightest and most saturated color"""
-    brightest = samples[0]
+    """Find the brightest and most saturated color in an (N, 3) sample array"""
+    # Score = 50% brightness + 50% saturation (argmax keeps the first best, like a strict > scan)
+    score = get_brightness(samples) * 0.5 + get_saturation(samples) * 255 * 0.5
+    return samples[score.argmax()]
 
-    for color in samples:
-        brightness_current = get_brightness(color)
-        brightness_best = get_brightness(brightest)
 
-        saturation_current = get_saturation(color)
-        saturation_best = get_saturation(brightest)
+def apply_color_op(colors, kind, factor):
+    """Apply one batch_color_ops transform to an RGB color or (K, 3) array of colors"""
+    import numpy as np
 
-        # Score = 50% brightness + 50% saturation
-        score_current = brightness_current * 0.5 + saturation_current * 255 * 0.5
-        score_best = brightness_best * 0.5 + saturation_best * 255 * 0.5
+    colors = np.asarray(colors)
+    rows = colors.reshape(-1, 3)
+    return batch_color_ops(rows, [(kind, factor)] * len(rows)).reshape(colors.shape)
 
-        if score_current > score_best:
-            brightest = color
 
-    return brightest
+def boost_saturation(colors, factor=1.5):
+    """Boost saturation of colors (gray colors are left as-is)"""
+    return apply_color_op(colors, 'saturate', factor)
 
 
-def boost_saturation(rgb, factor=1.5):
-    """Boost saturation of a color"""
-    max_val = max(rgb['r'], rgb['g'], rgb['b'])
-    min_val = min(rgb['r'], rgb['g'], rgb['b'])
+def adjust_brightness(colors, factor):
+    """Adjust brightness of colors"""
+    return apply_color_op(colors, 'brightness', factor)
 
-    if max_val == min_val:
-        return rgb  # Gray, can't boost
 
-    # Simple saturation boost by moving away from gray
-    gray = (rgb['r'] + rgb['g'] + rgb['b']) / 3
+def desaturate(colors, amount=0.5):
+    """Desaturate colors"""
+    return apply_color_op(colors, 'desaturate', amount)
 
-    return {
-        'r': min(255, round(gray + (rgb['r'] - gray) * factor)),
-        'g': min(255, round(gray + (rgb['g'] - gray) * factor)),
-        'b': min(255, round(gray + (rgb['b'] - gray) * factor))
-    }
 
+def batch_color_ops(base, ops):
+    """
+    Apply per-row color transforms to a (K, 3) array in one vectorized pass
 
-def adjust_brightness(rgb, factor):
-    """Adjust brightness of a color"""
-    return {
-        'r': min(255, max(0, round(rgb['r'] * factor))),
-        'g': min(255, max(0, round(rgb['g'] * factor))),
-        'b': min(255, max(0, round(rgb['b'] * factor)))
-    }
+    Args:
+        base: (K, 3) array of seed colors, one row per output color
+        ops: K (kind, factor) tuples, kind being 'saturate', 'brightness' or 'desaturate'
 
+    Returns:
+        (K, 3) uint8 array of transformed colors, clipped to 0-255
+    """
+    import numpy as np
 
-def desaturate(rgb, amount=0.5):
-    """Desaturate a color"""
-    gray = (rgb['r'] + rgb['g'] + rgb['b']) / 3
-    return {
-        'r': round(rgb['r'] + (gray - rgb['r']) * amount),
-        'g': round(rgb['g'] + (gray - rgb['g']) * amount),
-        'b': round(rgb['b'] + (gray - rgb['b']) * amount)
-    }
+    base = np.asarray(base, dtype=np.float64)
+    kinds = np.array([kind for kind, _ in ops])
+    factors = np.array([factor for _, factor in ops], dtype=np.float64)[:, None]
+    gray = base.sum(axis=1, keepdims=True) / 3
+
+    result = base.copy()
+
+    # Saturation boost moves away from gray (gray colors can't be boosted)
+    rows = (kinds == 'saturate') & (base.max(axis=1) != base.min(axis=1))
+    result[rows] = (gray + (base - gray) * factors)[rows]
+
+    rows = kinds == 'brightness'
+    result[rows] = (base * factors)[rows]
+
+    rows = kinds == 'desaturate'
+    result[rows] = (base + (gray - base) * factors)[rows]
+
+    return np.clip(np.round(result), 0, 255).astype(np.uint8)
 
 
-def normalize(rgb):
-    """Convert RGB to normalized array (0-1) for Babylon.js"""
-    return [rgb['r'] / 255, rgb['g'] / 255, rgb['b'] / 255]
+def format_rgb(color):
+    """Format an RGB array row as 'rgb(r, g, b)' for log output"""
+    return 'rgb({}, {}, {})'.format(*(int(v) for v in color))
 
 
-def rgb_to_hex(rgb):
-    """Convert RGB to hex color"""
-    return f"#{rgb['r']:02x}{rgb['g']:02x}{rgb['b']:02x}"
+def normalize_colors(colors):
+    """Convert a (K, 3) RGB array to normalized (0-1) lists for Babylon.js in one pass"""
+    import numpy as np
 
+    return (np.asarray(colors) / 255).tolist()
+
+
+def colors_to_hex(colors):
+    """Convert a (K, 3) RGB array to hex colors, packing each row into one integer"""
+    import numpy as np
+
+    colors = np.asarray(colors, dtype=np.uint32)
+    packed = (colors[:, 0] << 16) | (colors[:, 1] << 8) | colors[:, 2]
+    return [f'#{value:06x}' for value in packed.tolist()]
+
+
+def extract_colors_for_palette(block_texture_path, lock_overlay_path, theme_name, seed=None):
+    """Main color extraction function (pass a seed for a reproducible palette)"""
+    import numpy as np
 
-def extract_colors_for_palette(block_texture_path, lock_overlay_path, theme_name):
-    """Main color extraction function"""
     print(f"\n🎨 Extracting colors for \"{theme_name}\" theme via pixel sampling...")
+    rng = np.random.default_rng(seed)
 
     # Sample block texture for base colors
     print('📊 Sampling block texture (100 pixels)...')
-    block_samples = sample_image_colors(block_texture_path, 100)
-    avg_block_color = average_colors(block_samples)
-    print(f"   Average block color: rgb({avg_block_color['r']}, {avg_block_color['g']}, {avg_block_color['b']})")
+    block_samples = sample_image_colors(block_texture_path, 100, rng)
+    block_seed = block_samples.mean(axis=0).round().astype(np.uint8)
+    print(f"   Average block color: {format_rgb(block_seed)}")
 
     # Sample lock overlay for accent colors
     print('📊 Sampling lock overlay (50 pixels)...')
-    lock_samples = sample_image_colors(lock_overlay_path, 50)
+    lock_samples = sample_image_colors(lock_overlay_path, 50, rng)
 
     # Find the brightest, most saturated color for key emissive
-    brightest_color = find_brightest_color(lock_samples)
-    print(f"   Brightest color: rgb({brightest_color['r']}, {brightest_color['g']}, {brightest_color['b']})")
-    print(f"   Brightness: {round(get_brightness(brightest_color))}/255")
-    print(f"   Saturation: {round(get_saturation(brightest_color) * 100)}%")
-
-    # Boost for emissive glow
-    boosted_emissive = boost_saturation(brightest_color, 1.5)
-    print(f"   Boosted emissive: rgb({boosted_emissive['r']}, {boosted_emissive['g']}, {boosted_emissive['b']})")
-
-    # Derive other colors
-    arrow_color = adjust_brightness(avg_block_color, 0.8)
-    background_color_rgb = adjust_brightness(avg_block_color, 0.3)
-    locked_color = desaturate(avg_block_color, 0.5)
-    locked_arrow_color = adjust_brightness(locked_color, 0.6)
+    accent_seed = find_brightest_color(lock_samples)
+    print(f"   Brightest color: {format_rgb(accent_seed)}")
+    print(f"   Brightness: {round(float(get_brightness(accent_seed)))}/255")
+    print(f"   Saturation: {round(float(get_saturation(accent_seed)) * 100)}%")
+
+    # Derive all colors in one batch: name -> (seed color, transform, factor)
+    derived_specs = {
+        'boostedEmissive': (accent_seed, 'saturate', 1.5),  # Boost for emissive glow
+        'arrow': (block_seed, 'brightness', 0.8),
+        'background': (block_seed, 'brightness', 0.3),
+        'locked': (block_seed, 'desaturate', 0.5),
+        'block70': (block_seed, 'brightness', 0.7),
+        'block60': (block_seed, 'brightness', 0.6),
+        'block50': (block_seed, 'brightness', 0.5),
+        'accent90': (accent_seed, 'brightness', 0.9),
+        'accent70': (accent_seed, 'brightness', 0.7)
+    }
+    derived_colors = dict(zip(derived_specs, batch_color_ops(
+        [seed for seed, _, _ in derived_specs.values()],
+        [(kind, factor) for _, kind, factor in derived_specs.values()]
+    )))
+
+    # Locked arrow builds on the derived locked color
+    derived_colors['lockedArrow'] = adjust_brightness(derived_colors['locked'], 0.6)
+
+    print(f"   Boosted emissive: {format_rgb(derived_colors['boostedEmissive'])}")
+
+    # Every palette color as one (K, 3) array, converted to Babylon/CSS values in a single batch each
+    named_colors = {
+        'white': [255, 255, 255],  # Keep white for texture visibility
+        'keyArrow': [13, 13, 13],  # Dark for key blocks
+        'block': block_seed,
+        'accent': accent_seed,
+        **derived_colors
+    }
+    names = list(named_colors)
+    colors = np.array(list(named_colors.values()), dtype=np.uint8)
+    normalized = dict(zip(names, normalize_colors(colors)))
+    hex_colors = dict(zip(names, colors_to_hex(colors)))
 
     # Generate palette
     palette = {
         'name': theme_name.capitalize(),
         'version': '1.0.0',
         'babylon': {
-            'blockDefault': normalize({'r': 255, 'g': 255, 'b': 255}),  # Keep white for texture visibility
-            'arrowColor': normalize(arrow_color),
-            'keyArrowColor': normalize({'r': 13, 'g': 13, 'b': 13}),  # Dark for key blocks
-            'lockedArrowColor': normalize(locked_arrow_color),
-            'background': normalize(background_color_rgb) + [1.0],
-            'keyColor': normalize(brightest_color),
-            'keyEmissive': normalize(boosted_emissive),
-            'lockedColor': normalize(locked_color)
+            'blockDefault': normalized['white'],
+            'arrowColor': normalized['arrow'],
+            'keyArrowColor': normalized['keyArrow'],
+            'lockedArrowColor': normalized['lockedArrow'],
+            'background': normalized['background'] + [1.0],
+            'keyColor': normalized['accent'],
+            'keyEmissive': normalized['boostedEmissive'],
+            'lockedColor': normalized['locked']
         },
         'css': {
-            'headerBg': rgb_to_hex(avg_block_color),
-            'currencyContainer': rgb_to_hex(adjust_brightness(avg_block_color, 0.7)),
-            'currencyPill': rgb_to_hex(adjust_brightness(avg_block_color, 0.5)),
-            'bgBlue': rgb_to_hex(avg_block_color),
-            'darkBlue': rgb_to_hex(adjust_brightness(avg_block_color, 0.6)),
-            'accent': rgb_to_hex(brightest_color),
-            'accentDark': rgb_to_hex(adjust_brightness(brightest_color, 0.7)),
-            'buttonPrimary': rgb_to_hex(adjust_brightness(brightest_color, 0.9)),
-            'buttonPrimaryDark': rgb_to_hex(adjust_brightness(brightest_color, 0.7)),
-            'buttonSecondary': rgb_to_hex(avg_block_color),
-            'buttonSecondaryDark': rgb_to_hex(adjust_brightness(avg_block_color, 0.7))
+            'headerBg': hex_colors['block'],
+            'currencyContainer': hex_colors['block70'],
+            'currencyPill': hex_colors['block50'],
+            'bgBlue': hex_colors['block'],
+            'darkBlue': hex_colors['block60'],
+            'accent': hex_colors['accent'],
+            'accentDark': hex_colors['accent70'],
+            'buttonPrimary': hex_colors['accent90'],
+            'buttonPrimaryDark': hex_colors['accent70'],
+            'buttonSecondary': hex_colors['block'],
+            'buttonSecondaryDark': hex_colors['block70']
         }
     }
 
     print('\n✅ Color palette generated successfully via pixel sampling!')
-    print(f"   Key emissive: {rgb_to_hex(brightest_color)} (will POP visually!)")
+    print(f"   Key emissive: {hex_colors['accent']} (will POP visually!)")
 
     return palette
 